@@ -125,4 +125,4 @@ class DevStaticFiles(StaticFiles):
 
 
 # Serve static files for the frontend
-app.mount("/", StaticFiles(directory="../frontend", html=True), name="static")
+app.mount("/", StaticFiles(directory=config.FRONTEND_DIR, html=True), name="static")
@@ -26,6 +26,7 @@ class Config:
 
     # Database paths
     CHROMA_PATH: str = "./chroma_db"  # ChromaDB storage location
+    FRONTEND_DIR: str = os.getenv("FRONTEND_DIR", "../frontend")  # Static files
 
 
 config = Config()
@@ -1,9 +1,17 @@
 import os
 import re
-from typing import List, Tuple
+from typing import List, TextIO, Tuple, Union
 
 from models import Course, CourseChunk, Lesson
 
+# Compiled once at import - chunk_text runs for every lesson of every document
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Better sentence splitting that handles abbreviations
+# This regex looks for periods followed by whitespace and capital letters
+# but ignores common abbreviations
+_SENTENCE_RE = re.compile(r"(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\!|\?)\s+(?=[A-Z])")
+
 
 class DocumentProcessor:
     """Processes course documents and extracts structured information"""
@@ -12,8 +20,11 @@ class DocumentProcessor:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
 
-    def read_file(self, file_path: str) -> str:
-        """Read content from file with UTF-8 encoding"""
+    def read_file(self, file_path: Union[str, os.PathLike, TextIO]) -> str:
+        """Read content from file with UTF-8 encoding, or from an open text file"""
+        if hasattr(file_path, "read"):
+            return file_path.read()
+
         try:
             with open(file_path, "r", encoding="utf-8") as file:
                 return file.read()
@@ -26,15 +37,10 @@ class DocumentProcessor:
         """Split text into sentence-based chunks with overlap using config settings"""
 
         # Clean up the text
-        text = re.sub(r"\s+", " ", text.strip())  # Normalize whitespace
+        text = _WHITESPACE_RE.sub(" ", text.strip())  # Normalize whitespace
 
-        # Better sentence splitting that handles abbreviations
-        # This regex looks for periods followed by whitespace and capital letters
-        # but ignores common abbreviations
-        sentence_endings = re.compile(
-            r"(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\!|\?)\s+(?=[A-Z])"
-        )
-        sentences = sentence_endings.split(text)
+        # Split into sentences
+        sentences = _SENTENCE_RE.split(text)
 
         # Clean sentences
         sentences = [s.strip() for s in sentences if s.strip()]
@@ -95,7 +101,7 @@ class DocumentProcessor:
         return chunks
 
     def process_course_document(
-        self, file_path: str
+        self, file_path: Union[str, os.PathLike]
     ) -> Tuple[Course, List[CourseChunk]]:
         """
         Process a course document with expected format:
@@ -50,11 +50,8 @@ class RAGSystem:
                 file_path
             )
 
-            # Add course metadata to vector store for semantic search
-            self.vector_store.add_course_metadata(course)
-
-            # Add course content chunks to vector store
-            self.vector_store.add_course_content(course_chunks)
+            # Add course metadata and content chunks to vector store
+            self.vector_store.add_course(course, course_chunks)
 
             return course, len(course_chunks)
         except Exception as e:
@@ -104,8 +101,7 @@ class RAGSystem:
 
                     if course and course.title not in existing_course_titles:
                         # This is a new course - add it to the vector store
-                        self.vector_store.add_course_metadata(course)
-                        self.vector_store.add_course_content(course_chunks)
+                        self.vector_store.add_course(course, course_chunks)
                         total_courses += 1
                         total_chunks += len(course_chunks)
                         print(
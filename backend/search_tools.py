@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from functools import cached_property
 from typing import Any, Dict, Optional
 
 from vector_store import SearchResults, VectorStore
@@ -25,8 +26,9 @@ class CourseSearchTool(Tool):
         self.store = vector_store
         self.last_sources = []  # Track sources from last search
 
-    def get_tool_definition(self) -> Dict[str, Any]:
-        """Return Anthropic tool definition for this tool"""
+    @cached_property
+    def tool_definition(self) -> Dict[str, Any]:
+        """Anthropic tool definition for this tool, built once per instance"""
         return {
             "name": "search_course_content",
             "description": "Search course materials with smart course name matching and lesson filtering",
@@ -50,6 +52,10 @@ class CourseSearchTool(Tool):
             },
         }
 
+    def get_tool_definition(self) -> Dict[str, Any]:
+        """Return Anthropic tool definition for this tool"""
+        return self.tool_definition
+
     def execute(
         self,
         query: str,
@@ -132,8 +138,9 @@ class CourseOutlineTool(Tool):
         self.store = vector_store
         self.last_sources = []  # Track sources for UI
 
-    def get_tool_definition(self) -> Dict[str, Any]:
-        """Return Anthropic tool definition for course outline retrieval"""
+    @cached_property
+    def tool_definition(self) -> Dict[str, Any]:
+        """Anthropic tool definition for course outline retrieval, built once per instance"""
         return {
             "name": "get_course_outline",
             "description": "Get complete course outline showing all lessons with titles and numbers. Use when user asks about course structure, lesson list, table of contents, or what topics/lessons a course covers. Supports fuzzy course name matching.",
@@ -149,6 +156,10 @@ class CourseOutlineTool(Tool):
             },
         }
 
+    def get_tool_definition(self) -> Dict[str, Any]:
+        """Return Anthropic tool definition for course outline retrieval"""
+        return self.tool_definition
+
     def execute(self, course_name: str) -> str:
         """
         Execute outline retrieval.
@@ -1,43 +1,50 @@
+import sys
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Deque, Dict, Optional
 
+# Formatted history prefixes for the known roles; others fall back to role.title()
+_ROLE_PREFIXES = {"user": "User: ", "assistant": "Assistant: "}
 
-@dataclass
+
+@dataclass(slots=True)
 class Message:
     """Represents a single message in a conversation"""
 
     role: str  # "user" or "assistant"
     content: str  # The message content
 
+    def __post_init__(self):
+        # Only a couple of distinct roles exist, so share one string object per role
+        self.role = sys.intern(self.role)
+
 
 class SessionManager:
     """Manages conversation sessions and message history"""
 
     def __init__(self, max_history: int = 5):
         self.max_history = max_history
-        self.sessions: Dict[str, List[Message]] = {}
+        self.sessions: Dict[str, Deque[Message]] = {}
         self.session_counter = 0
+        # Formatted history per session, dropped whenever its messages change
+        self._history_cache: Dict[str, str] = {}
 
     def create_session(self) -> str:
         """Create a new conversation session"""
         self.session_counter += 1
         session_id = f"session_{self.session_counter}"
-        self.sessions[session_id] = []
+        self.sessions[session_id] = deque(maxlen=self.max_history * 2)
         return session_id
 
     def add_message(self, session_id: str, role: str, content: str):
         """Add a message to the conversation history"""
         if session_id not in self.sessions:
-            self.sessions[session_id] = []
+            self.sessions[session_id] = deque(maxlen=self.max_history * 2)
 
+        # The bounded deque drops the oldest message once max_history * 2 is reached
         message = Message(role=role, content=content)
         self.sessions[session_id].append(message)
-
-        # Keep conversation history within limits
-        if len(self.sessions[session_id]) > self.max_history * 2:
-            self.sessions[session_id] = self.sessions[session_id][
-                -self.max_history * 2 :
-            ]
+        self._history_cache.pop(session_id, None)
 
     def add_exchange(self, session_id: str, user_message: str, assistant_message: str):
         """Add a complete question-answer exchange"""
@@ -46,21 +53,24 @@ class SessionManager:
 
     def get_conversation_history(self, session_id: Optional[str]) -> Optional[str]:
         """Get formatted conversation history for a session"""
-        if not session_id or session_id not in self.sessions:
-            return None
+        if session_id in self._history_cache:
+            return self._history_cache[session_id]
 
-        messages = self.sessions[session_id]
+        # Missing sessions, a None session_id and empty histories are all falsy here
+        messages = self.sessions.get(session_id)
         if not messages:
             return None
 
         # Format messages for context
-        formatted_messages = []
-        for msg in messages:
-            formatted_messages.append(f"{msg.role.title()}: {msg.content}")
-
-        return "\n".join(formatted_messages)
+        history = "\n".join(
+            (_ROLE_PREFIXES.get(msg.role) or f"{msg.role.title()}: ") + msg.content
+            for msg in messages
+        )
+        self._history_cache[session_id] = history
+        return history
 
     def clear_session(self, session_id: str):
         """Clear all messages from a session"""
         if session_id in self.sessions:
-            self.sessions[session_id] = []
+            self.sessions[session_id].clear()
+            self._history_cache.pop(session_id, None)
@@ -1,9 +1,23 @@
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional
 
 import chromadb
 from chromadb.config import Settings
 from models import Course, CourseChunk
+from rapidfuzz import fuzz, process, utils
+
+# Minimum token_set_ratio score (0-100) for a course name to count as a match
+COURSE_MATCH_THRESHOLD = 60
+
+# Words wrapped around a course name ("the MCP course") that titles don't share
+_FILLER_WORDS = frozenset({"the", "course", "courses"})
+
+
+def _normalize_course_name(name: str) -> str:
+    """Lowercase a course name, strip punctuation and drop filler words"""
+    words = utils.default_process(name).split()
+    return " ".join(word for word in words if word not in _FILLER_WORDS)
 
 
 @dataclass
@@ -40,15 +54,52 @@ class SearchResults:
         return len(self.documents) == 0
 
 
+@lru_cache(maxsize=512)
+def _build_filter_cached(
+    course_title: Optional[str], lesson_number: Optional[int]
+) -> Optional[Dict]:
+    """Build ChromaDB filter from search parameters, reusing it for repeated inputs
+
+    The same dict is returned for equal arguments, so callers must not mutate it.
+    Chroma only reads the filter and rejects read-only mappings such as
+    MappingProxyType, so a plain dict is cached.
+    """
+    if not course_title and lesson_number is None:
+        return None
+
+    # Handle different filter combinations
+    if course_title and lesson_number is not None:
+        return {
+            "$and": [
+                {"course_title": course_title},
+                {"lesson_number": lesson_number},
+            ]
+        }
+
+    if course_title:
+        return {"course_title": course_title}
+
+    return {"lesson_number": lesson_number}
+
+
 class VectorStore:
     """Vector storage using ChromaDB for course content and metadata"""
 
-    def __init__(self, chroma_path: str, embedding_model: str, max_results: int = 5):
+    def __init__(
+        self,
+        chroma_path: Optional[str],
+        embedding_model: str,
+        max_results: int = 5,
+        client_type: Literal["persistent", "ephemeral"] = "persistent",
+    ):
         self.max_results = max_results
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(
-            path=chroma_path, settings=Settings(anonymized_telemetry=False)
-        )
+        # Initialize ChromaDB client; an ephemeral client keeps everything in
+        # memory and ignores chroma_path
+        settings = Settings(anonymized_telemetry=False)
+        if client_type == "ephemeral":
+            self.client = chromadb.EphemeralClient(settings=settings)
+        else:
+            self.client = chromadb.PersistentClient(path=chroma_path, settings=settings)
 
         # Set up sentence transformer embedding function
         self.embedding_function = (
@@ -65,6 +116,9 @@ class VectorStore:
             "course_content"
         )  # Actual course material
 
+        # Normalized catalog titles by title, cleared when the catalog changes
+        self._titles_cache: Optional[Dict[str, str]] = None
+
     def _create_collection(self, name: str):
         """Create or get a ChromaDB collection"""
         return self.client.get_or_create_collection(
@@ -113,43 +167,49 @@ class VectorStore:
             return SearchResults.empty(f"Search error: {str(e)}")
 
     def _resolve_course_name(self, course_name: str) -> Optional[str]:
-        """Use vector search to find best matching course by name"""
-        try:
-            results = self.course_catalog.query(query_texts=[course_name], n_results=1)
+        """Fuzzy-match a course name against the catalog titles"""
+        if self._titles_cache is None:
+            try:
+                titles = self._get_course_titles()
+            except Exception as e:
+                # Leave the cache unset so the next lookup retries the read
+                print(f"Error resolving course name: {e}")
+                return None
+            self._titles_cache = {
+                title: _normalize_course_name(title) for title in titles
+            }
 
-            if results["documents"][0] and results["metadatas"][0]:
-                # Return the title (which is now the ID)
-                return results["metadatas"][0][0]["title"]
-        except Exception as e:
-            print(f"Error resolving course name: {e}")
+        # The catalog is small, so string similarity beats an embedding query.
+        # token_set_ratio scores a name whose words all appear in a title as
+        # 100, so short names like "MCP" still match their full title
+        query = _normalize_course_name(course_name)
+        matches = process.extract(
+            query,
+            self._titles_cache,
+            scorer=fuzz.token_set_ratio,
+            score_cutoff=COURSE_MATCH_THRESHOLD,
+            limit=None,
+        )
+        if not matches:
+            return None
 
-        return None
+        # Break ties (e.g. a word shared by several titles) by overall similarity
+        _, _, title = max(matches, key=lambda m: (m[1], fuzz.ratio(query, m[0])))
+        return title
 
+    @staticmethod
     def _build_filter(
-        self, course_title: Optional[str], lesson_number: Optional[int]
+        course_title: Optional[str], lesson_number: Optional[int]
     ) -> Optional[Dict]:
         """Build ChromaDB filter from search parameters"""
-        if not course_title and lesson_number is None:
-            return None
-
-        # Handle different filter combinations
-        if course_title and lesson_number is not None:
-            return {
-                "$and": [
-                    {"course_title": course_title},
-                    {"lesson_number": lesson_number},
-                ]
-            }
-
-        if course_title:
-            return {"course_title": course_title}
-
-        return {"lesson_number": lesson_number}
+        return _build_filter_cached(course_title, lesson_number)
 
     def add_course_metadata(self, course: Course):
         """Add course information to the catalog for semantic search"""
         import json
 
+        self._titles_cache = None
+
         course_text = course.title
 
         # Build lessons metadata and serialize as JSON string
@@ -201,8 +261,14 @@ class VectorStore:
 
         self.course_content.add(documents=documents, metadatas=metadatas, ids=ids)
 
+    def add_course(self, course: Course, chunks: List[CourseChunk]):
+        """Add a course to the catalog together with its content chunks"""
+        self.add_course_metadata(course)
+        self.add_course_content(chunks)
+
     def clear_all_data(self):
         """Clear all data from both collections"""
+        self._titles_cache = None
         try:
             self.client.delete_collection("course_catalog")
             self.client.delete_collection("course_content")
@@ -212,14 +278,18 @@ class VectorStore:
         except Exception as e:
             print(f"Error clearing data: {e}")
 
+    def _get_course_titles(self) -> List[str]:
+        """Get all course titles from the catalog, letting Chroma errors propagate"""
+        # Get all documents from the catalog
+        results = self.course_catalog.get()
+        if results and "ids" in results:
+            return results["ids"]
+        return []
+
     def get_existing_course_titles(self) -> List[str]:
         """Get all existing course titles from the vector store"""
         try:
-            # Get all documents from the catalog
-            results = self.course_catalog.get()
-            if results and "ids" in results:
-                return results["ids"]
-            return []
+            return self._get_course_titles()
         except Exception as e:
             print(f"Error getting existing course titles: {e}")
             return []
@@ -1,25 +1,219 @@
 import pytest
 import sys
-from pathlib import Path
 import tempfile
 import os
+import re
+import types
+import zlib
+from unittest.mock import Mock, create_autospec
+
+# Every test patches the Anthropic client, so skip importing the real SDK
+# (httpx, pydantic models, ...) in each worker with a stand-in module
+_fake_anthropic = types.ModuleType("anthropic")
+_fake_anthropic.Anthropic = object
+sys.modules.setdefault("anthropic", _fake_anthropic)
+
+
+class HashingEmbeddingFunction:
+    """Deterministic bag-of-words embedder standing in for SentenceTransformer
+
+    Each lowercased word is hashed into one of 384 buckets (the size of
+    all-MiniLM-L6-v2 vectors) and the counts are L2-normalised, so texts that
+    share words land close together without loading a model. It implements
+    Chroma's EmbeddingFunction protocol without subclassing it, so conftest
+    doesn't import chromadb in every worker.
+    """
+
+    DIMENSIONS = 384
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", **kwargs):
+        self.model_name = model_name
+
+    def __call__(self, input):
+        return [self._embed(text) for text in input]
+
+    def _embed(self, text):
+        vector = [0.0] * self.DIMENSIONS
+        for token in re.findall(r"\w+", text.lower()):
+            vector[zlib.crc32(token.encode()) % self.DIMENSIONS] += 1.0
+        norm = sum(value * value for value in vector) ** 0.5
+        return [value / norm for value in vector] if norm else vector
+
+    @staticmethod
+    def name():
+        return "test_hashing"
+
+    @staticmethod
+    def build_from_config(config):
+        return HashingEmbeddingFunction(**config)
+
+    def get_config(self):
+        return {"model_name": self.model_name}
+
+    def is_legacy(self):
+        return False
+
+    def default_space(self):
+        return "l2"
+
+    def supported_spaces(self):
+        return ["cosine", "l2", "ip"]
+
+
+def pytest_addoption(parser):
+    """Add the --run-slow flag for the document parsing and chunking tests"""
+    parser.addoption(
+        "--run-slow", action="store_true", default=False, help="run tests marked as slow"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --run-slow is given or -m selects them"""
+    if config.getoption("--run-slow") or "slow" in config.getoption("markexpr"):
+        return
+
+    skip_slow = pytest.mark.skip(reason="needs --run-slow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
 
-# Add backend to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
 
-# Create a mock frontend directory before any imports
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_environment(tmp_path_factory):
     """Set up test environment before tests run"""
-    # Create a temporary frontend directory
-    frontend_dir = Path(__file__).parent.parent / "frontend"
-    if not frontend_dir.exists():
-        frontend_dir.mkdir(parents=True)
-        (frontend_dir / "index.html").write_text("<html><body>Test</body></html>")
-        yield
-        # Cleanup
-        if frontend_dir.exists():
-            import shutil
-            shutil.rmtree(frontend_dir)
-    else:
-        yield
+    # Build the frontend in a temporary directory instead of the repository;
+    # tmp_path_factory gives every xdist worker its own base directory
+    frontend_dir = tmp_path_factory.mktemp("frontend", numbered=False)
+    (frontend_dir / "index.html").write_text("<html><body>Test</body></html>")
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("FRONTEND_DIR", str(frontend_dir))
+        yield frontend_dir
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_regex():
+    """Compile document_processor's patterns before the first test is timed"""
+    import document_processor  # noqa: F401 - compiles the module-level patterns
+
+
+@pytest.fixture(scope="module")
+def mock_config():
+    """Create a mock configuration"""
+    config = Mock()
+    config.CHUNK_SIZE = 200
+    config.CHUNK_OVERLAP = 50
+    config.CHROMA_PATH = "./test_chroma"
+    config.EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+    config.MAX_RESULTS = 5
+    config.ANTHROPIC_API_KEY = "test_key"
+    config.ANTHROPIC_MODEL = "claude-test"
+    config.MAX_HISTORY = 2
+    return config
+
+
+@pytest.fixture(scope="module")
+def mock_vector_store():
+    """Create a mock VectorStore once per module, autospecced from the class"""
+    from vector_store import VectorStore
+
+    store = create_autospec(VectorStore, instance=True)
+    # Collections are set in __init__, so the class spec doesn't declare them
+    store.course_catalog = Mock()
+    store.course_content = Mock()
+    return store
+
+
+# Whether shared_vector_store holds exactly sample_course and sample_chunks
+_shared_store_state = {"sample_loaded": False}
+
+
+@pytest.fixture(scope="session")
+def shared_vector_store():
+    """Create a single in-memory VectorStore shared across all test modules"""
+    from vector_store import VectorStore
+
+    # Swap in the hashing embedder so the tests don't load the real model
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            "chromadb.utils.embedding_functions.SentenceTransformerEmbeddingFunction",
+            HashingEmbeddingFunction,
+        )
+        store = VectorStore(
+            chroma_path=None,
+            embedding_model="all-MiniLM-L6-v2",
+            max_results=5,
+            client_type="ephemeral",
+        )
+    yield store
+    # Stop Chroma's system, then drop the cached system so no later client can
+    # pick up the stopped one
+    store.client._system.stop()
+    store.client.clear_system_cache()
+
+
+@pytest.fixture
+def clean_vector_store(shared_vector_store):
+    """Provide an empty vector store for tests that write to it"""
+    # Clear data before each test
+    shared_vector_store.clear_all_data()
+    _shared_store_state["sample_loaded"] = False
+    return shared_vector_store
+
+
+@pytest.fixture
+def populated_vector_store(shared_vector_store, sample_course, sample_chunks):
+    """Provide the vector store loaded with the sample course for read-only tests
+
+    The sample data is written once and reused by consecutive read-only tests;
+    it is only reloaded after clean_vector_store has emptied the store, so any
+    test that writes to shared_vector_store must request clean_vector_store.
+    """
+    if not _shared_store_state["sample_loaded"]:
+        shared_vector_store.clear_all_data()
+        shared_vector_store.add_course(sample_course, sample_chunks)
+        _shared_store_state["sample_loaded"] = True
+    return shared_vector_store
+
+
+@pytest.fixture(scope="session")
+def sample_course():
+    """Create a sample course for testing"""
+    from models import Course, Lesson
+
+    return Course(
+        title="Introduction to Python",
+        course_link="https://example.com/python",
+        instructor="Jane Doe",
+        lessons=[
+            Lesson(lesson_number=0, title="Getting Started", lesson_link="https://example.com/lesson0"),
+            Lesson(lesson_number=1, title="Variables", lesson_link="https://example.com/lesson1")
+        ]
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_chunks():
+    """Create sample course chunks for testing"""
+    from models import CourseChunk
+
+    return [
+        CourseChunk(
+            content="Python is a high-level programming language",
+            course_title="Introduction to Python",
+            lesson_number=0,
+            chunk_index=0
+        ),
+        CourseChunk(
+            content="Variables store data in Python",
+            course_title="Introduction to Python",
+            lesson_number=1,
+            chunk_index=1
+        ),
+        CourseChunk(
+            content="Functions help organize code",
+            course_title="Introduction to Python",
+            lesson_number=1,
+            chunk_index=2
+        )
+    ]
@@ -1,42 +1,82 @@
 import pytest
-import sys
-from pathlib import Path
-from unittest.mock import Mock, MagicMock, patch
-
-# Add backend to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from unittest.mock import patch
 
 from ai_generator import AIGenerator
 
 
-@pytest.fixture
-def mock_anthropic_client():
-    """Create a mock Anthropic client"""
-    return Mock()
+@dataclass(slots=True)
+class FakeBlock:
+    """Lightweight stand-in for an Anthropic content block"""
+
+    type: str = "text"
+    text: str = ""
+    name: str = ""
+    id: str = ""
+    input: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class FakeResponse:
+    """Lightweight stand-in for an Anthropic message response"""
+
+    content: list = field(default_factory=list)
+    stop_reason: str = "end_turn"
+
+
+class CountingStub:
+    """Callable that returns canned results in order and records its calls"""
+
+    def __init__(self, results):
+        self._results = iter(results)
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return next(self._results)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module", autouse=True)
+def _patch_anthropic():
+    """Patch the Anthropic client class once for the whole module"""
+    with patch('ai_generator.anthropic.Anthropic') as mock_anthropic:
+        yield mock_anthropic
+
+
+@pytest.fixture(scope="module")
+def mock_anthropic_client(_patch_anthropic):
+    """The mock client returned by the patched Anthropic class"""
+    return _patch_anthropic.return_value
+
+
+@pytest.fixture(scope="module")
 def ai_generator(mock_anthropic_client):
     """Create an AIGenerator instance with mocked client"""
-    with patch('ai_generator.anthropic.Anthropic', return_value=mock_anthropic_client):
-        generator = AIGenerator(api_key="test_key", model="claude-test")
-        generator.client = mock_anthropic_client
-        return generator
+    return AIGenerator(api_key="test_key", model="claude-test")
+
+
+@pytest.fixture(autouse=True)
+def _reset_anthropic_mocks(_patch_anthropic, mock_anthropic_client):
+    """Keep call counts and configured responses local to each test"""
+    _patch_anthropic.reset_mock()
+    mock_anthropic_client.reset_mock(return_value=True, side_effect=True)
 
 
 class TestAIGenerator:
     """Tests for AIGenerator class"""
 
-    def test_init(self):
+    def test_init(self, _patch_anthropic):
         """Test AIGenerator initialization"""
-        with patch('ai_generator.anthropic.Anthropic') as mock_anthropic:
-            generator = AIGenerator(api_key="test_key", model="claude-sonnet-test")
+        generator = AIGenerator(api_key="test_key", model="claude-sonnet-test")
 
-            mock_anthropic.assert_called_once_with(api_key="test_key")
-            assert generator.model == "claude-sonnet-test"
-            assert generator.base_params['model'] == "claude-sonnet-test"
-            assert generator.base_params['temperature'] == 0
-            assert generator.base_params['max_tokens'] == 800
+        assert _patch_anthropic.call_count == 1
+        assert _patch_anthropic.call_args.args == ()
+        assert _patch_anthropic.call_args.kwargs == {"api_key": "test_key"}
+        assert generator.model == "claude-sonnet-test"
+        assert generator.base_params['model'] == "claude-sonnet-test"
+        assert generator.base_params['temperature'] == 0
+        assert generator.base_params['max_tokens'] == 800
 
     def test_system_prompt_exists(self):
         """Test that system prompt is defined"""
@@ -46,18 +86,15 @@ class TestAIGenerator:
 
     def test_generate_response_simple(self, ai_generator, mock_anthropic_client):
         """Test generating a simple response without tools"""
-        # Mock response
-        mock_response = Mock()
-        mock_response.stop_reason = "end_turn"
-        mock_response.content = [Mock(text="Test response")]
+        mock_response = FakeResponse(content=[FakeBlock(text="Test response")])
 
         mock_anthropic_client.messages.create.return_value = mock_response
 
         result = ai_generator.generate_response(query="Test query")
 
         # Verify API was called
-        mock_anthropic_client.messages.create.assert_called_once()
-        call_args = mock_anthropic_client.messages.create.call_args[1]
+        assert mock_anthropic_client.messages.create.call_count == 1
+        call_args = mock_anthropic_client.messages.create.call_args.kwargs
 
         assert call_args['model'] == "claude-test"
         assert call_args['messages'][0]['content'] == "Test query"
@@ -65,9 +102,7 @@ class TestAIGenerator:
 
     def test_generate_response_with_history(self, ai_generator, mock_anthropic_client):
         """Test generating response with conversation history"""
-        mock_response = Mock()
-        mock_response.stop_reason = "end_turn"
-        mock_response.content = [Mock(text="Response with history")]
+        mock_response = FakeResponse(content=[FakeBlock(text="Response with history")])
 
         mock_anthropic_client.messages.create.return_value = mock_response
 
@@ -78,15 +113,13 @@ class TestAIGenerator:
         )
 
         # Verify history was included in system prompt
-        call_args = mock_anthropic_client.messages.create.call_args[1]
+        call_args = mock_anthropic_client.messages.create.call_args.kwargs
         assert "Previous conversation:" in call_args['system']
         assert history in call_args['system']
 
     def test_generate_response_with_tools(self, ai_generator, mock_anthropic_client):
         """Test generating response with tools available"""
-        mock_response = Mock()
-        mock_response.stop_reason = "end_turn"
-        mock_response.content = [Mock(text="Response with tools")]
+        mock_response = FakeResponse(content=[FakeBlock(text="Response with tools")])
 
         mock_anthropic_client.messages.create.return_value = mock_response
 
@@ -97,7 +130,7 @@ class TestAIGenerator:
         )
 
         # Verify tools were included
-        call_args = mock_anthropic_client.messages.create.call_args[1]
+        call_args = mock_anthropic_client.messages.create.call_args.kwargs
         assert 'tools' in call_args
         assert call_args['tools'] == tools
         assert call_args['tool_choice'] == {"type": "auto"}
@@ -105,19 +138,13 @@ class TestAIGenerator:
     def test_generate_response_tool_use(self, ai_generator, mock_anthropic_client):
         """Test handling tool use in response"""
         # Mock initial response with tool use
-        mock_tool_block = Mock()
-        mock_tool_block.type = "tool_use"
-        mock_tool_block.name = "search_tool"
-        mock_tool_block.id = "tool_123"
-        mock_tool_block.input = {"query": "test"}
-
-        initial_response = Mock()
-        initial_response.stop_reason = "tool_use"
-        initial_response.content = [mock_tool_block]
+        mock_tool_block = FakeBlock(
+            type="tool_use", name="search_tool", id="tool_123", input={"query": "test"}
+        )
+        initial_response = FakeResponse(content=[mock_tool_block], stop_reason="tool_use")
 
         # Mock final response after tool execution
-        final_response = Mock()
-        final_response.content = [Mock(text="Final response")]
+        final_response = FakeResponse(content=[FakeBlock(text="Final response")])
 
         mock_anthropic_client.messages.create.side_effect = [
             initial_response,
@@ -125,8 +152,7 @@ class TestAIGenerator:
         ]
 
         # Mock tool manager
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.return_value = "Tool result"
+        mock_tool_manager = SimpleNamespace(execute_tool=CountingStub(["Tool result"]))
 
         tools = [{"name": "search_tool"}]
         result = ai_generator.generate_response(
@@ -136,10 +162,9 @@ class TestAIGenerator:
         )
 
         # Verify tool was executed
-        mock_tool_manager.execute_tool.assert_called_once_with(
-            "search_tool",
-            query="test"
-        )
+        assert mock_tool_manager.execute_tool.calls == [
+            (("search_tool",), {"query": "test"})
+        ]
 
         # Verify final response was returned
         assert result == "Final response"
@@ -150,24 +175,18 @@ class TestAIGenerator:
     def test_handle_tool_execution(self, ai_generator, mock_anthropic_client):
         """Test _handle_tool_execution method"""
         # Mock tool use block
-        mock_tool_block = Mock()
-        mock_tool_block.type = "tool_use"
-        mock_tool_block.name = "test_tool"
-        mock_tool_block.id = "tool_123"
-        mock_tool_block.input = {"param": "value"}
-
-        initial_response = Mock()
-        initial_response.content = [mock_tool_block]
+        mock_tool_block = FakeBlock(
+            type="tool_use", name="test_tool", id="tool_123", input={"param": "value"}
+        )
+        initial_response = FakeResponse(content=[mock_tool_block], stop_reason="tool_use")
 
         # Mock final response
-        final_response = Mock()
-        final_response.content = [Mock(text="Final result")]
+        final_response = FakeResponse(content=[FakeBlock(text="Final result")])
 
         mock_anthropic_client.messages.create.return_value = final_response
 
         # Mock tool manager
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.return_value = "Tool output"
+        mock_tool_manager = SimpleNamespace(execute_tool=CountingStub(["Tool output"]))
 
         base_params = {
             "messages": [{"role": "user", "content": "Test"}],
@@ -181,10 +200,9 @@ class TestAIGenerator:
         )
 
         # Verify tool was executed
-        mock_tool_manager.execute_tool.assert_called_once_with(
-            "test_tool",
-            param="value"
-        )
+        assert mock_tool_manager.execute_tool.calls == [
+            (("test_tool",), {"param": "value"})
+        ]
 
         # Verify result
         assert result == "Final result"
@@ -192,28 +210,23 @@ class TestAIGenerator:
     def test_handle_tool_execution_multiple_tools(self, ai_generator, mock_anthropic_client):
         """Test handling multiple tool calls"""
         # Mock multiple tool blocks
-        tool_block1 = Mock()
-        tool_block1.type = "tool_use"
-        tool_block1.name = "tool1"
-        tool_block1.id = "id1"
-        tool_block1.input = {"param": "value1"}
-
-        tool_block2 = Mock()
-        tool_block2.type = "tool_use"
-        tool_block2.name = "tool2"
-        tool_block2.id = "id2"
-        tool_block2.input = {"param": "value2"}
-
-        initial_response = Mock()
-        initial_response.content = [tool_block1, tool_block2]
+        tool_block1 = FakeBlock(
+            type="tool_use", name="tool1", id="id1", input={"param": "value1"}
+        )
+        tool_block2 = FakeBlock(
+            type="tool_use", name="tool2", id="id2", input={"param": "value2"}
+        )
+        initial_response = FakeResponse(
+            content=[tool_block1, tool_block2], stop_reason="tool_use"
+        )
 
-        final_response = Mock()
-        final_response.content = [Mock(text="Final")]
+        final_response = FakeResponse(content=[FakeBlock(text="Final")])
 
         mock_anthropic_client.messages.create.return_value = final_response
 
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.side_effect = ["Result 1", "Result 2"]
+        mock_tool_manager = SimpleNamespace(
+            execute_tool=CountingStub(["Result 1", "Result 2"])
+        )
 
         base_params = {
             "messages": [{"role": "user", "content": "Test"}],
@@ -227,29 +240,24 @@ class TestAIGenerator:
         )
 
         # Verify both tools were executed
-        assert mock_tool_manager.execute_tool.call_count == 2
+        assert mock_tool_manager.execute_tool.calls == [
+            (("tool1",), {"param": "value1"}),
+            (("tool2",), {"param": "value2"}),
+        ]
 
     def test_handle_tool_execution_ignores_non_tool_blocks(self, ai_generator, mock_anthropic_client):
         """Test that non-tool blocks are ignored"""
-        text_block = Mock()
-        text_block.type = "text"
-
-        tool_block = Mock()
-        tool_block.type = "tool_use"
-        tool_block.name = "test_tool"
-        tool_block.id = "id"
-        tool_block.input = {}
-
-        initial_response = Mock()
-        initial_response.content = [text_block, tool_block]
+        text_block = FakeBlock(type="text")
+        tool_block = FakeBlock(type="tool_use", name="test_tool", id="id", input={})
+        initial_response = FakeResponse(
+            content=[text_block, tool_block], stop_reason="tool_use"
+        )
 
-        final_response = Mock()
-        final_response.content = [Mock(text="Final")]
+        final_response = FakeResponse(content=[FakeBlock(text="Final")])
 
         mock_anthropic_client.messages.create.return_value = final_response
 
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.return_value = "Result"
+        mock_tool_manager = SimpleNamespace(execute_tool=CountingStub(["Result"]))
 
         base_params = {
             "messages": [{"role": "user", "content": "Test"}],
@@ -263,7 +271,7 @@ class TestAIGenerator:
         )
 
         # Only the tool_use block should be executed
-        assert mock_tool_manager.execute_tool.call_count == 1
+        assert len(mock_tool_manager.execute_tool.calls) == 1
 
     def test_base_params_configured_correctly(self, ai_generator):
         """Test that base_params are configured correctly"""
@@ -273,28 +281,24 @@ class TestAIGenerator:
 
     def test_generate_response_without_history(self, ai_generator, mock_anthropic_client):
         """Test that system prompt doesn't include history section when no history"""
-        mock_response = Mock()
-        mock_response.stop_reason = "end_turn"
-        mock_response.content = [Mock(text="Response")]
+        mock_response = FakeResponse(content=[FakeBlock(text="Response")])
 
         mock_anthropic_client.messages.create.return_value = mock_response
 
         ai_generator.generate_response(query="Test", conversation_history=None)
 
-        call_args = mock_anthropic_client.messages.create.call_args[1]
+        call_args = mock_anthropic_client.messages.create.call_args.kwargs
         assert "Previous conversation:" not in call_args['system']
 
     def test_generate_response_system_prompt_format(self, ai_generator, mock_anthropic_client):
         """Test that system prompt is properly formatted"""
-        mock_response = Mock()
-        mock_response.stop_reason = "end_turn"
-        mock_response.content = [Mock(text="Response")]
+        mock_response = FakeResponse(content=[FakeBlock(text="Response")])
 
         mock_anthropic_client.messages.create.return_value = mock_response
 
         ai_generator.generate_response(query="Test")
 
-        call_args = mock_anthropic_client.messages.create.call_args[1]
+        call_args = mock_anthropic_client.messages.create.call_args.kwargs
         system_content = call_args['system']
 
         # Verify system prompt includes key elements
@@ -1,11 +1,29 @@
 import pytest
-import sys
-from pathlib import Path
 from pydantic import BaseModel
 from typing import List, Optional
 
-# Add backend to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+
+# Mirror the request/response models declared in app.py. Importing app
+# directly would build a full RAGSystem and mount the frontend at import.
+class QueryRequest(BaseModel):
+    query: str
+    session_id: Optional[str] = None
+
+
+class SourceItem(BaseModel):
+    text: str
+    link: Optional[str] = None
+
+
+class QueryResponse(BaseModel):
+    answer: str
+    sources: List[SourceItem]
+    session_id: str
+
+
+class CourseStats(BaseModel):
+    total_courses: int
+    course_titles: List[str]
 
 
 class TestPydanticModels:
@@ -14,10 +32,6 @@ class TestPydanticModels:
     def test_query_request_model(self):
         """Test QueryRequest model validation"""
 
-        class QueryRequest(BaseModel):
-            query: str
-            session_id: Optional[str] = None
-
         # Valid with only query
         request = QueryRequest(query="Test query")
         assert request.query == "Test query"
@@ -31,10 +45,6 @@ class TestPydanticModels:
     def test_source_item_model(self):
         """Test SourceItem model"""
 
-        class SourceItem(BaseModel):
-            text: str
-            link: Optional[str] = None
-
         # With link
         source = SourceItem(text="Source 1", link="https://example.com")
         assert source.text == "Source 1"
@@ -48,15 +58,6 @@ class TestPydanticModels:
     def test_query_response_model(self):
         """Test QueryResponse model"""
 
-        class SourceItem(BaseModel):
-            text: str
-            link: Optional[str] = None
-
-        class QueryResponse(BaseModel):
-            answer: str
-            sources: List[SourceItem]
-            session_id: str
-
         sources = [
             SourceItem(text="Source 1", link="https://example.com")
         ]
@@ -74,10 +75,6 @@ class TestPydanticModels:
     def test_course_stats_model(self):
         """Test CourseStats model"""
 
-        class CourseStats(BaseModel):
-            total_courses: int
-            course_titles: List[str]
-
         stats = CourseStats(
             total_courses=5,
             course_titles=["Course 1", "Course 2", "Course 3", "Course 4", "Course 5"]
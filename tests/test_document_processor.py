@@ -1,40 +1,103 @@
+import functools
+import io
 import pytest
-import sys
-from pathlib import Path
-import tempfile
-import os
-
-# Add backend to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
 
 from document_processor import DocumentProcessor
 from models import Course, CourseChunk
 
 
-@pytest.fixture
+_SAMPLE_COURSE_BYTES = (
+    b"Course Title: Introduction to Python\n"
+    b"Course Link: https://example.com/python\n"
+    b"Course Instructor: Jane Doe\n"
+    b"\n"
+    b"Lesson 0: Getting Started\n"
+    b"Lesson Link: https://example.com/python/lesson0\n"
+    b"This is the introduction to Python programming. Python is a high-level programming language. It is great for beginners and experts alike.\n"
+    b"\n"
+    b"Lesson 1: Variables and Data Types\n"
+    b"Lesson Link: https://example.com/python/lesson1\n"
+    b"Variables store data in Python. Common data types include integers, floats, strings, and booleans. You can use the type() function to check data types.\n"
+)
+
+_COURSE_VARIANTS = {
+    "unicode": "Héllo Wörld 你好",
+    "incomplete": """Some Title
+Some content here without proper formatting.
+This is lesson content.
+""",
+    "no_lessons": """Course Title: Test Course
+Course Link: https://example.com
+Course Instructor: Test Instructor
+
+This is just some general content without lesson structure.
+More content here.
+""",
+    "multi_lesson": """Course Title: Multi-Lesson Course
+Course Link: https://example.com/course
+Course Instructor: Instructor Name
+
+Lesson 0: First Lesson
+Lesson Link: https://example.com/lesson0
+Content for first lesson.
+
+Lesson 1: Second Lesson
+Lesson Link: https://example.com/lesson1
+Content for second lesson.
+
+Lesson 2: Third Lesson
+Lesson Link: https://example.com/lesson2
+Content for third lesson.
+""",
+    "no_link": """Course Title: Test Course
+Course Link: https://example.com
+Course Instructor: Test Instructor
+
+Lesson 0: Lesson Without Link
+This lesson has no link specified.
+Content goes here.
+""",
+}
+
+
+@pytest.fixture(scope="session")
 def doc_processor():
-    """Create a DocumentProcessor instance for testing"""
+    """Create a DocumentProcessor instance shared across all tests"""
     return DocumentProcessor(chunk_size=200, chunk_overlap=50)
 
 
-@pytest.fixture
-def sample_course_file(tmp_path):
-    """Create a sample course file for testing"""
-    content = """Course Title: Introduction to Python
-Course Link: https://example.com/python
-Course Instructor: Jane Doe
+@pytest.fixture(scope="session")
+def processor_factory():
+    """Return one shared DocumentProcessor per (chunk_size, chunk_overlap)"""
+    return functools.lru_cache(maxsize=None)(
+        lambda size, overlap: DocumentProcessor(chunk_size=size, chunk_overlap=overlap)
+    )
+
+
+@pytest.fixture(scope="session")
+def _sample_course_template(tmp_path_factory):
+    """Write the sample course file once per session"""
+    file_path = tmp_path_factory.mktemp("courses") / "python_course.txt"
+    file_path.write_bytes(_SAMPLE_COURSE_BYTES)
+    return file_path
 
-Lesson 0: Getting Started
-Lesson Link: https://example.com/python/lesson0
-This is the introduction to Python programming. Python is a high-level programming language. It is great for beginners and experts alike.
 
-Lesson 1: Variables and Data Types
-Lesson Link: https://example.com/python/lesson1
-Variables store data in Python. Common data types include integers, floats, strings, and booleans. You can use the type() function to check data types.
-"""
-    file_path = tmp_path / "python_course.txt"
-    file_path.write_text(content)
-    return str(file_path)
+@pytest.fixture(scope="session")
+def processed_sample(doc_processor, _sample_course_template):
+    """Parse the sample course once and share the (course, chunks) result"""
+    return doc_processor.process_course_document(_sample_course_template)
+
+
+@pytest.fixture(scope="session")
+def course_variant_files(tmp_path_factory):
+    """Write each course document variant once, keyed by variant name"""
+    variants_dir = tmp_path_factory.mktemp("docs")
+    paths = {}
+    for name, content in _COURSE_VARIANTS.items():
+        file_path = variants_dir / f"{name}.txt"
+        file_path.write_text(content, encoding="utf-8")
+        paths[name] = file_path
+    return paths
 
 
 class TestDocumentProcessor:
@@ -46,24 +109,19 @@ class TestDocumentProcessor:
         assert processor.chunk_size == 500
         assert processor.chunk_overlap == 100
 
-    def test_read_file(self, doc_processor, tmp_path):
-        """Test reading a file with UTF-8 encoding"""
-        test_file = tmp_path / "test.txt"
-        test_file.write_text("Hello, World!")
-
-        content = doc_processor.read_file(str(test_file))
+    def test_read_file(self, doc_processor):
+        """Test reading from an already open text file"""
+        content = doc_processor.read_file(io.StringIO("Hello, World!"))
         assert content == "Hello, World!"
 
-    def test_read_file_with_unicode(self, doc_processor, tmp_path):
+    def test_read_file_with_unicode(self, doc_processor, course_variant_files):
         """Test reading a file with unicode characters"""
-        test_file = tmp_path / "unicode.txt"
-        test_file.write_text("Héllo Wörld 你好")
-
-        content = doc_processor.read_file(str(test_file))
+        content = doc_processor.read_file(course_variant_files["unicode"])
         assert "Héllo" in content
         assert "Wörld" in content
         assert "你好" in content
 
+    @pytest.mark.slow
     def test_chunk_text_simple(self, doc_processor):
         """Test chunking simple text"""
         text = "This is sentence one. This is sentence two. This is sentence three."
@@ -72,34 +130,36 @@ class TestDocumentProcessor:
         assert len(chunks) > 0
         assert all(isinstance(chunk, str) for chunk in chunks)
 
-    def test_chunk_text_respects_size(self):
-        """Test that chunks respect the configured size"""
-        processor = DocumentProcessor(chunk_size=50, chunk_overlap=10)
-        text = "This is a sentence. " * 20  # Long text with sentence breaks
+    @pytest.mark.parametrize(
+        "size,overlap,text,min_chunks",
+        [
+            # Long text with sentence breaks should not end up in one chunk
+            (50, 10, "This is a sentence. " * 20, 2),
+            # With overlap, should have more chunks
+            (
+                100,
+                20,
+                "This is the first sentence. This is the second sentence. This is the third sentence. This is the fourth sentence.",
+                2,
+            ),
+        ],
+        ids=["respects_size", "with_overlap"],
+    )
+    @pytest.mark.slow
+    def test_chunk_text_with_custom_settings(self, processor_factory, size, overlap, text, min_chunks):
+        """Test that chunks respect the configured size and overlap"""
+        processor = processor_factory(size, overlap)
 
         chunks = processor.chunk_text(text)
 
-        # Most chunks should be near the chunk_size (allowing some flexibility)
-        # At least one chunk should exist
-        assert len(chunks) > 0
-        # Chunks should be reasonable size (not all text in one chunk)
-        assert len(chunks) > 1
-
-    def test_chunk_text_with_overlap(self):
-        """Test that chunks have proper overlap"""
-        processor = DocumentProcessor(chunk_size=100, chunk_overlap=20)
-        text = "This is the first sentence. This is the second sentence. This is the third sentence. This is the fourth sentence."
-
-        chunks = processor.chunk_text(text)
-
-        # With overlap, should have more chunks
-        assert len(chunks) >= 2
+        assert len(chunks) >= min_chunks
 
     def test_chunk_text_empty_string(self, doc_processor):
         """Test chunking empty string"""
         chunks = doc_processor.chunk_text("")
         assert chunks == []
 
+    @pytest.mark.slow
     def test_chunk_text_single_sentence(self, doc_processor):
         """Test chunking single sentence"""
         text = "This is a single sentence."
@@ -108,9 +168,11 @@ class TestDocumentProcessor:
         assert len(chunks) == 1
         assert chunks[0] == text
 
-    def test_process_course_document_basic(self, doc_processor, sample_course_file):
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("docproc")
+    def test_process_course_document_basic(self, processed_sample):
         """Test processing a basic course document"""
-        course, chunks = doc_processor.process_course_document(sample_course_file)
+        course, chunks = processed_sample
 
         # Verify course metadata
         assert isinstance(course, Course)
@@ -132,9 +194,11 @@ class TestDocumentProcessor:
         assert all(isinstance(chunk, CourseChunk) for chunk in chunks)
         assert all(chunk.course_title == "Introduction to Python" for chunk in chunks)
 
-    def test_process_course_document_chunks_have_content(self, doc_processor, sample_course_file):
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("docproc")
+    def test_process_course_document_chunks_have_content(self, processed_sample):
         """Test that course chunks have proper content and metadata"""
-        course, chunks = doc_processor.process_course_document(sample_course_file)
+        course, chunks = processed_sample
 
         # Check that chunks have content
         for chunk in chunks:
@@ -143,9 +207,11 @@ class TestDocumentProcessor:
             assert chunk.lesson_number is not None
             assert isinstance(chunk.chunk_index, int)
 
-    def test_process_course_document_chunk_context(self, doc_processor, sample_course_file):
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("docproc")
+    def test_process_course_document_chunk_context(self, processed_sample):
         """Test that chunks include lesson context"""
-        course, chunks = doc_processor.process_course_document(sample_course_file)
+        course, chunks = processed_sample
 
         # At least some chunks should have lesson context
         context_found = False
@@ -156,68 +222,45 @@ class TestDocumentProcessor:
 
         assert context_found
 
-    def test_process_course_document_missing_metadata(self, doc_processor, tmp_path):
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("docproc")
+    def test_process_course_document_missing_metadata(self, doc_processor, course_variant_files):
         """Test processing document with missing metadata"""
-        content = """Some Title
-Some content here without proper formatting.
-This is lesson content.
-"""
-        file_path = tmp_path / "incomplete.txt"
-        file_path.write_text(content)
-
-        course, chunks = doc_processor.process_course_document(str(file_path))
+        course, chunks = doc_processor.process_course_document(
+            course_variant_files["incomplete"]
+        )
 
         # Should still process, using fallbacks
         assert isinstance(course, Course)
         assert course.title is not None
 
-    def test_process_course_document_no_lessons(self, doc_processor, tmp_path):
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("docproc")
+    def test_process_course_document_no_lessons(self, doc_processor, course_variant_files):
         """Test processing document with no lesson markers"""
-        content = """Course Title: Test Course
-Course Link: https://example.com
-Course Instructor: Test Instructor
-
-This is just some general content without lesson structure.
-More content here.
-"""
-        file_path = tmp_path / "no_lessons.txt"
-        file_path.write_text(content)
-
-        course, chunks = doc_processor.process_course_document(str(file_path))
+        course, chunks = doc_processor.process_course_document(
+            course_variant_files["no_lessons"]
+        )
 
         assert isinstance(course, Course)
         assert course.title == "Test Course"
         # Should still create chunks from the content
         assert len(chunks) > 0
 
-    def test_process_course_document_multiple_lessons(self, doc_processor, tmp_path):
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("docproc")
+    def test_process_course_document_multiple_lessons(self, doc_processor, course_variant_files):
         """Test processing document with multiple lessons"""
-        content = """Course Title: Multi-Lesson Course
-Course Link: https://example.com/course
-Course Instructor: Instructor Name
-
-Lesson 0: First Lesson
-Lesson Link: https://example.com/lesson0
-Content for first lesson.
-
-Lesson 1: Second Lesson
-Lesson Link: https://example.com/lesson1
-Content for second lesson.
-
-Lesson 2: Third Lesson
-Lesson Link: https://example.com/lesson2
-Content for third lesson.
-"""
-        file_path = tmp_path / "multi_lesson.txt"
-        file_path.write_text(content)
-
-        course, chunks = doc_processor.process_course_document(str(file_path))
+        course, chunks = doc_processor.process_course_document(
+            course_variant_files["multi_lesson"]
+        )
 
         assert len(course.lessons) == 3
         assert course.lessons[0].lesson_number == 0
         assert course.lessons[1].lesson_number == 1
         assert course.lessons[2].lesson_number == 2
 
+    @pytest.mark.slow
     def test_chunk_text_normalizes_whitespace(self, doc_processor):
         """Test that chunk_text normalizes whitespace"""
         text = "This   has    multiple     spaces.\n\n\nAnd multiple newlines."
@@ -228,28 +271,23 @@ Content for third lesson.
             assert "   " not in chunk  # No triple spaces
             assert "\n\n" not in chunk  # No double newlines
 
-    def test_chunk_index_increments(self, doc_processor, sample_course_file):
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("docproc")
+    def test_chunk_index_increments(self, processed_sample):
         """Test that chunk indexes increment properly"""
-        course, chunks = doc_processor.process_course_document(sample_course_file)
+        course, chunks = processed_sample
 
         # Check that chunk indexes are sequential
         indexes = [chunk.chunk_index for chunk in chunks]
         assert indexes == list(range(len(chunks)))
 
-    def test_process_course_document_lesson_without_link(self, doc_processor, tmp_path):
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("docproc")
+    def test_process_course_document_lesson_without_link(self, doc_processor, course_variant_files):
         """Test processing lesson without a lesson link"""
-        content = """Course Title: Test Course
-Course Link: https://example.com
-Course Instructor: Test Instructor
-
-Lesson 0: Lesson Without Link
-This lesson has no link specified.
-Content goes here.
-"""
-        file_path = tmp_path / "no_link.txt"
-        file_path.write_text(content)
-
-        course, chunks = doc_processor.process_course_document(str(file_path))
+        course, chunks = doc_processor.process_course_document(
+            course_variant_files["no_link"]
+        )
 
         assert len(course.lessons) == 1
         assert course.lessons[0].lesson_link is None
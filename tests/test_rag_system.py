@@ -1,68 +1,85 @@
 import pytest
-import sys
 from pathlib import Path
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import DEFAULT, Mock, MagicMock, patch
 import tempfile
 import os
 
-# Add backend to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
-
 from rag_system import RAGSystem
 from models import Course, Lesson
 
 
-@pytest.fixture
-def mock_config():
-    """Create a mock configuration"""
-    config = Mock()
-    config.CHUNK_SIZE = 200
-    config.CHUNK_OVERLAP = 50
-    config.CHROMA_PATH = "./test_chroma"
-    config.EMBEDDING_MODEL = "all-MiniLM-L6-v2"
-    config.MAX_RESULTS = 5
-    config.ANTHROPIC_API_KEY = "test_key"
-    config.ANTHROPIC_MODEL = "claude-test"
-    config.MAX_HISTORY = 2
-    return config
+@pytest.fixture(scope="module")
+def rag_system(mock_config):
+    """Create a RAGSystem instance with mocked components once per module"""
+    with patch.multiple(
+        'rag_system',
+        DocumentProcessor=DEFAULT,
+        VectorStore=DEFAULT,
+        AIGenerator=DEFAULT,
+        SessionManager=DEFAULT,
+        CourseSearchTool=DEFAULT,
+        CourseOutlineTool=DEFAULT,
+    ):
+        system = RAGSystem(mock_config)
+
+    # Mock the components
+    system.document_processor = Mock()
+    system.vector_store = Mock()
+    system.ai_generator = Mock()
+    system.session_manager = Mock()
+    system.tool_manager = Mock()
+    system.search_tool = Mock()
+    system.outline_tool = Mock()
+
+    return system
+
+
+@pytest.fixture(autouse=True)
+def _reset_component_mocks(rag_system):
+    """Keep call counts and configured responses local to each test"""
+    for component in (
+        rag_system.document_processor,
+        rag_system.vector_store,
+        rag_system.ai_generator,
+        rag_system.session_manager,
+        rag_system.tool_manager,
+        rag_system.search_tool,
+        rag_system.outline_tool,
+    ):
+        component.reset_mock(return_value=True, side_effect=True)
 
 
 @pytest.fixture
-def rag_system(mock_config):
-    """Create a RAGSystem instance with mocked components"""
-    with patch('rag_system.DocumentProcessor'), \
-         patch('rag_system.VectorStore'), \
-         patch('rag_system.AIGenerator'), \
-         patch('rag_system.SessionManager'), \
-         patch('rag_system.CourseSearchTool'), \
-         patch('rag_system.CourseOutlineTool'):
-        system = RAGSystem(mock_config)
+def sample_course_file():
+    """Path of a sample course file; process_course_document is mocked, so it is never read"""
+    return "/courses/test_course.txt"
 
-        # Mock the components
-        system.document_processor = Mock()
-        system.vector_store = Mock()
-        system.ai_generator = Mock()
-        system.session_manager = Mock()
-        system.tool_manager = Mock()
-        system.search_tool = Mock()
-        system.outline_tool = Mock()
 
-        return system
+# Three .txt courses, two other supported formats and two files that are skipped
+_COURSE_FOLDER_FILES = (
+    "course1.txt",
+    "course2.txt",
+    "course3.txt",
+    "course2.pdf",
+    "course3.docx",
+    "readme.md",
+    "data.json",
+)
+_SUPPORTED_COURSE_FILES = {"course1.txt", "course2.txt", "course3.txt", "course2.pdf", "course3.docx"}
 
 
 @pytest.fixture
-def sample_course_file(tmp_path):
-    """Create a sample course file"""
-    content = """Course Title: Test Course
-Course Link: https://example.com
-Course Instructor: Test Instructor
+def course_folder():
+    """Fake a course folder listing _COURSE_FOLDER_FILES without touching disk"""
+    with patch('rag_system.os.listdir', return_value=list(_COURSE_FOLDER_FILES)), \
+         patch('rag_system.os.path.exists', return_value=True), \
+         patch('rag_system.os.path.isfile', return_value=True):
+        yield "/courses"
+
 
-Lesson 0: Introduction
-Lesson content here.
-"""
-    file_path = tmp_path / "test_course.txt"
-    file_path.write_text(content)
-    return str(file_path)
+def _course_from_file_name(file_path, chunk_count=1):
+    """Fake process_course_document result titled after the file name; chunks are only counted"""
+    return Course(title=Path(file_path).name, lessons=[]), [object() for _ in range(chunk_count)]
 
 
 class TestRAGSystem:
@@ -70,28 +87,31 @@ class TestRAGSystem:
 
     def test_init(self, mock_config):
         """Test RAGSystem initialization"""
-        with patch('rag_system.DocumentProcessor') as mock_doc_proc, \
-             patch('rag_system.VectorStore') as mock_vec_store, \
-             patch('rag_system.AIGenerator') as mock_ai_gen, \
-             patch('rag_system.SessionManager') as mock_session_mgr, \
-             patch('rag_system.ToolManager') as mock_tool_mgr, \
-             patch('rag_system.CourseSearchTool') as mock_search_tool, \
-             patch('rag_system.CourseOutlineTool') as mock_outline_tool:
+        with patch.multiple(
+            'rag_system',
+            DocumentProcessor=DEFAULT,
+            VectorStore=DEFAULT,
+            AIGenerator=DEFAULT,
+            SessionManager=DEFAULT,
+            ToolManager=DEFAULT,
+            CourseSearchTool=DEFAULT,
+            CourseOutlineTool=DEFAULT,
+        ) as mocks:
 
             system = RAGSystem(mock_config)
 
             # Verify all components were initialized
-            mock_doc_proc.assert_called_once_with(200, 50)
-            mock_vec_store.assert_called_once_with("./test_chroma", "all-MiniLM-L6-v2", 5)
-            mock_ai_gen.assert_called_once_with("test_key", "claude-test")
-            mock_session_mgr.assert_called_once_with(2)
-            mock_tool_mgr.assert_called_once()
+            mocks['DocumentProcessor'].assert_called_once_with(200, 50)
+            mocks['VectorStore'].assert_called_once_with("./test_chroma", "all-MiniLM-L6-v2", 5)
+            mocks['AIGenerator'].assert_called_once_with("test_key", "claude-test")
+            mocks['SessionManager'].assert_called_once_with(2)
+            mocks['ToolManager'].assert_called_once()
 
     def test_add_course_document_success(self, rag_system, sample_course_file):
         """Test successfully adding a course document"""
         # Mock document processor
         mock_course = Course(title="Test Course", lessons=[])
-        mock_chunks = [Mock(), Mock()]
+        mock_chunks = [object(), object()]
         rag_system.document_processor.process_course_document.return_value = (
             mock_course,
             mock_chunks
@@ -105,8 +125,7 @@ class TestRAGSystem:
         )
 
         # Verify vector store was updated
-        rag_system.vector_store.add_course_metadata.assert_called_once_with(mock_course)
-        rag_system.vector_store.add_course_content.assert_called_once_with(mock_chunks)
+        rag_system.vector_store.add_course.assert_called_once_with(mock_course, mock_chunks)
 
         # Verify return values
         assert course == mock_course
@@ -123,75 +142,44 @@ class TestRAGSystem:
         assert course is None
         assert chunk_count == 0
 
-    def test_add_course_folder_success(self, rag_system, tmp_path):
+    def test_add_course_folder_success(self, rag_system, course_folder):
         """Test adding all courses from a folder"""
-        # Create test files
-        for i in range(3):
-            file_path = tmp_path / f"course{i}.txt"
-            file_path.write_text(f"Course content {i}")
-
-        # Mock document processor
-        def mock_process(file_path):
-            return (
-                Course(title=f"Course {file_path}", lessons=[]),
-                [Mock(), Mock()]
-            )
-
-        rag_system.document_processor.process_course_document.side_effect = mock_process
-        rag_system.vector_store.get_existing_course_titles.return_value = []
-
-        total_courses, total_chunks = rag_system.add_course_folder(str(tmp_path))
-
-        # Should process all 3 files
-        assert rag_system.document_processor.process_course_document.call_count == 3
-        assert total_courses == 3
-        assert total_chunks == 6  # 2 chunks per course
-
-    def test_add_course_folder_skip_existing(self, rag_system, tmp_path):
-        """Test that existing courses are skipped"""
-        # Create test files
-        file1 = tmp_path / "course1.txt"
-        file1.write_text("Course 1")
-        file2 = tmp_path / "course2.txt"
-        file2.write_text("Course 2")
-
-        # Mock existing courses
-        rag_system.vector_store.get_existing_course_titles.return_value = ["Course 1"]
-
-        # Mock processing
-        def mock_process(file_path):
-            if "course1" in file_path:
-                return Course(title="Course 1", lessons=[]), []
-            else:
-                return Course(title="Course 2", lessons=[]), [Mock()]
-
-        rag_system.document_processor.process_course_document.side_effect = mock_process
-
-        total_courses, total_chunks = rag_system.add_course_folder(str(tmp_path))
-
-        # Only Course 2 should be added (Course 1 already exists)
-        assert total_courses == 1
-        assert total_chunks == 1
-
-    def test_add_course_folder_clear_existing(self, rag_system, tmp_path):
-        """Test clearing existing data before adding courses"""
-        file1 = tmp_path / "course1.txt"
-        file1.write_text("Course 1")
-
-        rag_system.document_processor.process_course_document.return_value = (
-            Course(title="Course 1", lessons=[]),
-            [Mock()]
+        rag_system.document_processor.process_course_document.side_effect = (
+            lambda file_path: _course_from_file_name(file_path, chunk_count=2)
         )
         rag_system.vector_store.get_existing_course_titles.return_value = []
 
-        rag_system.add_course_folder(str(tmp_path), clear_existing=True)
-
-        # Verify clear was called
-        rag_system.vector_store.clear_all_data.assert_called_once()
+        total_courses, total_chunks = rag_system.add_course_folder(course_folder)
+
+        # Should process all 5 supported files
+        assert rag_system.document_processor.process_course_document.call_count == 5
+        assert total_courses == 5
+        assert total_chunks == 10  # 2 chunks per course
+
+    @pytest.mark.parametrize(
+        "existing,clear,expected",
+        [
+            (["course1.txt"], False, (4, 4)),
+            ([], True, (5, 5)),
+        ],
+        ids=["skip_existing", "clear_existing"],
+    )
+    def test_add_course_folder_existing_courses(
+        self, rag_system, course_folder, existing, clear, expected
+    ):
+        """Test that existing courses are skipped and clear_existing wipes the store first"""
+        rag_system.vector_store.get_existing_course_titles.return_value = existing
+        rag_system.document_processor.process_course_document.side_effect = _course_from_file_name
+
+        result = rag_system.add_course_folder(course_folder, clear_existing=clear)
+
+        assert result == expected
+        assert rag_system.vector_store.clear_all_data.call_count == int(clear)
 
     def test_add_course_folder_nonexistent_path(self, rag_system):
         """Test handling of nonexistent folder path"""
-        total_courses, total_chunks = rag_system.add_course_folder("/nonexistent/path")
+        with patch('rag_system.os.path.exists', return_value=False):
+            total_courses, total_chunks = rag_system.add_course_folder("/nonexistent/path")
 
         assert total_courses == 0
         assert total_chunks == 0
@@ -287,44 +275,33 @@ class TestRAGSystem:
         assert len(analytics['course_titles']) == 5
         assert "Course 1" in analytics['course_titles']
 
-    def test_add_course_folder_filters_file_types(self, rag_system, tmp_path):
+    def test_add_course_folder_filters_file_types(self, rag_system, course_folder):
         """Test that only specific file types are processed"""
-        # Create various file types
-        (tmp_path / "course1.txt").write_text("Content")
-        (tmp_path / "course2.pdf").write_text("Content")
-        (tmp_path / "course3.docx").write_text("Content")
-        (tmp_path / "readme.md").write_text("Content")  # Should be skipped
-        (tmp_path / "data.json").write_text("Content")  # Should be skipped
-
-        rag_system.document_processor.process_course_document.return_value = (
-            Course(title="Course", lessons=[]),
-            [Mock()]
-        )
+        rag_system.document_processor.process_course_document.side_effect = _course_from_file_name
         rag_system.vector_store.get_existing_course_titles.return_value = []
 
-        rag_system.add_course_folder(str(tmp_path))
+        rag_system.add_course_folder(course_folder)
 
-        # Should only process .txt, .pdf, .docx files (3 total)
-        assert rag_system.document_processor.process_course_document.call_count == 3
+        # Should only process .txt, .pdf, .docx files (readme.md and data.json are skipped)
+        processed = {
+            Path(call.args[0]).name
+            for call in rag_system.document_processor.process_course_document.call_args_list
+        }
+        assert processed == _SUPPORTED_COURSE_FILES
 
-    def test_add_course_folder_handles_errors(self, rag_system, tmp_path):
+    def test_add_course_folder_handles_errors(self, rag_system, course_folder):
         """Test that errors in processing individual files don't stop the process"""
-        # Create test files
-        (tmp_path / "course1.txt").write_text("Content 1")
-        (tmp_path / "course2.txt").write_text("Content 2")
-        (tmp_path / "course3.txt").write_text("Content 3")
-
         # Mock one file failing
         def mock_process(file_path):
-            if "course2" in file_path:
+            if Path(file_path).name == "course2.txt":
                 raise Exception("Processing error")
-            return Course(title=f"Course {file_path}", lessons=[]), [Mock()]
+            return _course_from_file_name(file_path)
 
         rag_system.document_processor.process_course_document.side_effect = mock_process
         rag_system.vector_store.get_existing_course_titles.return_value = []
 
-        total_courses, total_chunks = rag_system.add_course_folder(str(tmp_path))
+        total_courses, total_chunks = rag_system.add_course_folder(course_folder)
 
-        # Should process 2 out of 3 files (one failed)
-        assert total_courses == 2
-        assert total_chunks == 2
+        # Should process 4 out of 5 files (one failed)
+        assert total_courses == 4
+        assert total_chunks == 4
@@ -1,35 +1,53 @@
 import pytest
-import sys
-from pathlib import Path
 from unittest.mock import Mock, MagicMock
 import shutil
 
-# Add backend to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
-
 from search_tools import CourseSearchTool, CourseOutlineTool, ToolManager
-from vector_store import VectorStore, SearchResults
+from vector_store import SearchResults
 from models import Course, Lesson
 
 
-@pytest.fixture
-def mock_vector_store():
-    """Create a mock VectorStore for testing"""
-    return Mock(spec=VectorStore)
+# Search results only read by the tools, so one instance serves every test
+_ONE_DOC = SearchResults(
+    documents=["Content"],
+    metadata=[{"course_title": "Python Course", "lesson_number": 1}],
+    distances=[0.1]
+)
+_EMPTY = SearchResults(documents=[], metadata=[], distances=[])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def course_search_tool(mock_vector_store):
     """Create a CourseSearchTool instance"""
     return CourseSearchTool(mock_vector_store)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def course_outline_tool(mock_vector_store):
     """Create a CourseOutlineTool instance"""
     return CourseOutlineTool(mock_vector_store)
 
 
+@pytest.fixture(scope="module")
+def tool_manager():
+    """Create one ToolManager for the module; registered tools are cleared per test"""
+    return ToolManager()
+
+
+@pytest.fixture(autouse=True)
+def _clear_tool_manager(tool_manager):
+    """Start every test with no registered tools"""
+    tool_manager.tools.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_search_mocks(mock_vector_store, course_search_tool, course_outline_tool):
+    """Keep store calls, configured responses and tracked sources local to each test"""
+    mock_vector_store.reset_mock(return_value=True, side_effect=True)
+    course_search_tool.last_sources = []
+    course_outline_tool.last_sources = []
+
+
 class TestCourseSearchTool:
     """Tests for CourseSearchTool class"""
 
@@ -49,68 +67,36 @@ class TestCourseSearchTool:
         assert 'query' in definition['input_schema']['properties']
         assert 'query' in definition['input_schema']['required']
 
-    def test_execute_successful_search(self, course_search_tool, mock_vector_store):
-        """Test successful search execution"""
-        # Mock search results
-        mock_results = SearchResults(
-            documents=["Python is a programming language"],
-            metadata=[{"course_title": "Python Course", "lesson_number": 1}],
-            distances=[0.1],
-            error=None
-        )
-        mock_vector_store.search.return_value = mock_results
+        # The definition is built once and reused on later calls
+        assert course_search_tool.get_tool_definition() is definition
+
+    @pytest.mark.parametrize(
+        "kwargs,expected_call",
+        [
+            ({"query": "Python"}, {"course_name": None, "lesson_number": None}),
+            (
+                {"query": "Python", "course_name": "Python Course"},
+                {"course_name": "Python Course", "lesson_number": None},
+            ),
+            ({"query": "Python", "lesson_number": 1}, {"course_name": None, "lesson_number": 1}),
+        ],
+        ids=["no_filter", "course_filter", "lesson_filter"],
+    )
+    def test_execute_search(self, course_search_tool, mock_vector_store, kwargs, expected_call):
+        """Test search execution passes filters through and formats the results"""
+        mock_vector_store.search.return_value = _ONE_DOC
         mock_vector_store.get_lesson_link.return_value = "https://example.com/lesson1"
 
-        result = course_search_tool.execute(query="Python")
+        result = course_search_tool.execute(**kwargs)
 
         # Verify search was called
-        mock_vector_store.search.assert_called_once_with(
-            query="Python",
-            course_name=None,
-            lesson_number=None
-        )
+        mock_vector_store.search.assert_called_once_with(query="Python", **expected_call)
 
         # Verify result format
         assert isinstance(result, str)
         assert "Python Course" in result
         assert "Lesson 1" in result
 
-    def test_execute_with_course_filter(self, course_search_tool, mock_vector_store):
-        """Test search with course name filter"""
-        mock_results = SearchResults(
-            documents=["Content"],
-            metadata=[{"course_title": "Python Course", "lesson_number": 1}],
-            distances=[0.1]
-        )
-        mock_vector_store.search.return_value = mock_results
-        mock_vector_store.get_lesson_link.return_value = None
-
-        course_search_tool.execute(query="Python", course_name="Python Course")
-
-        mock_vector_store.search.assert_called_once_with(
-            query="Python",
-            course_name="Python Course",
-            lesson_number=None
-        )
-
-    def test_execute_with_lesson_filter(self, course_search_tool, mock_vector_store):
-        """Test search with lesson number filter"""
-        mock_results = SearchResults(
-            documents=["Content"],
-            metadata=[{"course_title": "Python Course", "lesson_number": 1}],
-            distances=[0.1]
-        )
-        mock_vector_store.search.return_value = mock_results
-        mock_vector_store.get_lesson_link.return_value = None
-
-        course_search_tool.execute(query="Python", lesson_number=1)
-
-        mock_vector_store.search.assert_called_once_with(
-            query="Python",
-            course_name=None,
-            lesson_number=1
-        )
-
     def test_execute_error_handling(self, course_search_tool, mock_vector_store):
         """Test handling of search errors"""
         mock_results = SearchResults.empty("Test error")
@@ -122,8 +108,7 @@ class TestCourseSearchTool:
 
     def test_execute_empty_results(self, course_search_tool, mock_vector_store):
         """Test handling of empty search results"""
-        mock_results = SearchResults(documents=[], metadata=[], distances=[])
-        mock_vector_store.search.return_value = mock_results
+        mock_vector_store.search.return_value = _EMPTY
 
         result = course_search_tool.execute(query="Python")
 
@@ -131,8 +116,7 @@ class TestCourseSearchTool:
 
     def test_execute_empty_results_with_filters(self, course_search_tool, mock_vector_store):
         """Test empty results message includes filter information"""
-        mock_results = SearchResults(documents=[], metadata=[], distances=[])
-        mock_vector_store.search.return_value = mock_results
+        mock_vector_store.search.return_value = _EMPTY
 
         result = course_search_tool.execute(
             query="Python",
@@ -199,6 +183,9 @@ class TestCourseOutlineTool:
         assert 'course_name' in definition['input_schema']['properties']
         assert 'course_name' in definition['input_schema']['required']
 
+        # The definition is built once and reused on later calls
+        assert course_outline_tool.get_tool_definition() is definition
+
     def test_execute_successful(self, course_outline_tool, mock_vector_store):
         """Test successful outline retrieval"""
         import json
@@ -281,23 +268,21 @@ class TestToolManager:
         manager = ToolManager()
         assert manager.tools == {}
 
-    def test_register_tool(self, course_search_tool):
+    def test_register_tool(self, tool_manager, course_search_tool):
         """Test registering a tool"""
-        manager = ToolManager()
-        manager.register_tool(course_search_tool)
+        tool_manager.register_tool(course_search_tool)
 
-        assert 'search_course_content' in manager.tools
-        assert manager.tools['search_course_content'] == course_search_tool
+        assert 'search_course_content' in tool_manager.tools
+        assert tool_manager.tools['search_course_content'] == course_search_tool
 
-    def test_register_multiple_tools(self, course_search_tool, course_outline_tool):
+    def test_register_multiple_tools(self, tool_manager, course_search_tool, course_outline_tool):
         """Test registering multiple tools"""
-        manager = ToolManager()
-        manager.register_tool(course_search_tool)
-        manager.register_tool(course_outline_tool)
+        tool_manager.register_tool(course_search_tool)
+        tool_manager.register_tool(course_outline_tool)
 
-        assert len(manager.tools) == 2
-        assert 'search_course_content' in manager.tools
-        assert 'get_course_outline' in manager.tools
+        assert len(tool_manager.tools) == 2
+        assert 'search_course_content' in tool_manager.tools
+        assert 'get_course_outline' in tool_manager.tools
 
     def test_register_tool_without_name(self):
         """Test that registering tool without name raises error"""
@@ -310,77 +295,65 @@ class TestToolManager:
         with pytest.raises(ValueError, match="Tool must have a 'name'"):
             manager.register_tool(mock_tool)
 
-    def test_get_tool_definitions(self, course_search_tool, course_outline_tool):
+    def test_get_tool_definitions(self, tool_manager, course_search_tool, course_outline_tool):
         """Test getting all tool definitions"""
-        manager = ToolManager()
-        manager.register_tool(course_search_tool)
-        manager.register_tool(course_outline_tool)
+        tool_manager.register_tool(course_search_tool)
+        tool_manager.register_tool(course_outline_tool)
 
-        definitions = manager.get_tool_definitions()
+        definitions = tool_manager.get_tool_definitions()
 
         assert len(definitions) == 2
         assert any(d['name'] == 'search_course_content' for d in definitions)
         assert any(d['name'] == 'get_course_outline' for d in definitions)
 
-    def test_execute_tool(self, course_search_tool, mock_vector_store):
+    def test_execute_tool(self, tool_manager, course_search_tool, mock_vector_store):
         """Test executing a registered tool"""
-        manager = ToolManager()
-        manager.register_tool(course_search_tool)
+        tool_manager.register_tool(course_search_tool)
 
         # Mock the search
-        mock_results = SearchResults(
-            documents=["Content"],
-            metadata=[{"course_title": "Course", "lesson_number": 1}],
-            distances=[0.1]
-        )
-        mock_vector_store.search.return_value = mock_results
+        mock_vector_store.search.return_value = _ONE_DOC
         mock_vector_store.get_lesson_link.return_value = None
 
-        result = manager.execute_tool('search_course_content', query="Python")
+        result = tool_manager.execute_tool('search_course_content', query="Python")
 
         assert isinstance(result, str)
 
-    def test_execute_nonexistent_tool(self):
+    def test_execute_nonexistent_tool(self, tool_manager):
         """Test executing a tool that doesn't exist"""
-        manager = ToolManager()
-
-        result = manager.execute_tool('nonexistent_tool', query="test")
+        result = tool_manager.execute_tool('nonexistent_tool', query="test")
 
         assert "not found" in result
 
-    def test_get_last_sources(self, course_search_tool):
+    def test_get_last_sources(self, tool_manager, course_search_tool):
         """Test getting last sources from tools"""
-        manager = ToolManager()
-        manager.register_tool(course_search_tool)
+        tool_manager.register_tool(course_search_tool)
 
         # Set some sources
         course_search_tool.last_sources = [
             {"text": "Source 1", "link": "https://example.com"}
         ]
 
-        sources = manager.get_last_sources()
+        sources = tool_manager.get_last_sources()
 
         assert len(sources) == 1
         assert sources[0]['text'] == "Source 1"
 
-    def test_get_last_sources_no_sources(self):
+    def test_get_last_sources_no_sources(self, tool_manager):
         """Test getting last sources when no tools have sources"""
-        manager = ToolManager()
-        sources = manager.get_last_sources()
+        sources = tool_manager.get_last_sources()
         assert sources == []
 
-    def test_reset_sources(self, course_search_tool, course_outline_tool):
+    def test_reset_sources(self, tool_manager, course_search_tool, course_outline_tool):
         """Test resetting sources from all tools"""
-        manager = ToolManager()
-        manager.register_tool(course_search_tool)
-        manager.register_tool(course_outline_tool)
+        tool_manager.register_tool(course_search_tool)
+        tool_manager.register_tool(course_outline_tool)
 
         # Set sources
         course_search_tool.last_sources = [{"text": "Source 1", "link": None}]
         course_outline_tool.last_sources = [{"text": "Source 2", "link": None}]
 
         # Reset
-        manager.reset_sources()
+        tool_manager.reset_sources()
 
         # Verify all sources are cleared
         assert course_search_tool.last_sources == []
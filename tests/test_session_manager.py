@@ -1,9 +1,4 @@
 import pytest
-import sys
-from pathlib import Path
-
-# Add backend to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
 
 from session_manager import SessionManager, Message
 
@@ -23,6 +18,19 @@ class TestMessage:
         assert hasattr(msg, "role")
         assert hasattr(msg, "content")
 
+    def test_message_interns_role(self):
+        """Test that equal roles share one string object"""
+        role = "".join(["us", "er"])  # Built at runtime, so not interned already
+        msg = Message(role=role, content="Hello")
+        assert msg.role is Message(role="user", content="Hi").role
+
+    def test_message_uses_slots(self):
+        """Test Message stores its fields in slots rather than a per-instance dict"""
+        msg = Message(role="user", content="Hello")
+        assert not hasattr(msg, "__dict__")
+        with pytest.raises(AttributeError):
+            msg.contnet = "typo"
+
 
 class TestSessionManager:
     """Tests for SessionManager class"""
@@ -45,7 +53,7 @@ class TestSessionManager:
         session_id = manager.create_session()
         assert session_id == "session_1"
         assert session_id in manager.sessions
-        assert manager.sessions[session_id] == []
+        assert list(manager.sessions[session_id]) == []
         assert manager.session_counter == 1
 
     def test_create_multiple_sessions(self):
@@ -162,6 +170,28 @@ class TestSessionManager:
         expected = "User: What is Python?\nAssistant: Python is a programming language\nUser: Tell me more\nAssistant: It's great for beginners"
         assert history == expected
 
+    def test_get_conversation_history_other_role(self):
+        """Test that roles other than user/assistant are title-cased"""
+        manager = SessionManager()
+        manager.add_message("session", "system", "Be brief")
+
+        assert manager.get_conversation_history("session") == "System: Be brief"
+
+    def test_get_conversation_history_cached(self):
+        """Test that history is reused until the session changes"""
+        manager = SessionManager()
+        session_id = manager.create_session()
+        manager.add_exchange(session_id, "Hello", "Hi")
+
+        history = manager.get_conversation_history(session_id)
+        assert manager.get_conversation_history(session_id) is history
+
+        manager.add_message(session_id, "user", "Bye")
+        assert manager.get_conversation_history(session_id) == "User: Hello\nAssistant: Hi\nUser: Bye"
+
+        manager.clear_session(session_id)
+        assert manager.get_conversation_history(session_id) is None
+
     def test_clear_session(self):
         """Test clearing all messages from a session"""
         manager = SessionManager()
@@ -1,95 +1,22 @@
 import pytest
-import sys
 from pathlib import Path
-import tempfile
-import shutil
-
-# Add backend to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
+from unittest.mock import patch
 
 from vector_store import VectorStore, SearchResults
-from models import Course, CourseChunk, Lesson
-
-
-@pytest.fixture(scope="module")
-def temp_chroma_path():
-    """Create a temporary directory for ChromaDB - shared across all tests"""
-    path = tempfile.mkdtemp(prefix="test_chroma_")
-    yield path
-    # Cleanup with retry
-    import gc
-    import time
-    gc.collect()
-    time.sleep(0.2)
-    try:
-        shutil.rmtree(path, ignore_errors=True)
-    except:
-        pass
-
-
-@pytest.fixture(scope="module")
-def shared_vector_store(temp_chroma_path):
-    """Create a single VectorStore instance shared across all tests"""
-    store = VectorStore(
-        chroma_path=temp_chroma_path,
-        embedding_model="all-MiniLM-L6-v2",
-        max_results=5
-    )
-    yield store
-    # Cleanup
-    try:
-        store.clear_all_data()
-        del store.client
-        del store
-    except:
-        pass
-
-
-@pytest.fixture
-def vector_store(shared_vector_store):
-    """Provide a clean vector store for each test"""
-    # Clear data before each test
-    shared_vector_store.clear_all_data()
-    return shared_vector_store
-
-
-@pytest.fixture
-def sample_course():
-    """Create a sample course for testing"""
-    return Course(
-        title="Introduction to Python",
-        course_link="https://example.com/python",
-        instructor="Jane Doe",
-        lessons=[
-            Lesson(lesson_number=0, title="Getting Started", lesson_link="https://example.com/lesson0"),
-            Lesson(lesson_number=1, title="Variables", lesson_link="https://example.com/lesson1")
-        ]
-    )
+from models import Course
 
 
-@pytest.fixture
-def sample_chunks():
-    """Create sample course chunks for testing"""
-    return [
-        CourseChunk(
-            content="Python is a high-level programming language",
-            course_title="Introduction to Python",
-            lesson_number=0,
-            chunk_index=0
-        ),
-        CourseChunk(
-            content="Variables store data in Python",
-            course_title="Introduction to Python",
-            lesson_number=1,
-            chunk_index=1
-        ),
-        CourseChunk(
-            content="Functions help organize code",
-            course_title="Introduction to Python",
-            lesson_number=1,
-            chunk_index=2
-        )
-    ]
+DOCS_DIR = Path(__file__).resolve().parents[1] / "docs"
+
+
+def _docs_courses():
+    """Read the Course Title/Link/Instructor headers of the courses in docs/"""
+    courses = []
+    for path in sorted(DOCS_DIR.glob("*.txt")):
+        header = path.read_text(encoding="utf-8").splitlines()[:3]
+        title, link, instructor = (line.split(":", 1)[1].strip() for line in header)
+        courses.append(Course(title=title, course_link=link, instructor=instructor))
+    return courses
 
 
 class TestSearchResults:
@@ -147,78 +74,80 @@ class TestSearchResults:
 class TestVectorStore:
     """Tests for VectorStore class"""
 
-    def test_init(self, vector_store):
+    def test_init(self, clean_vector_store):
         """Test VectorStore initialization"""
-        assert vector_store.max_results == 5
-        assert vector_store.client is not None
-        assert vector_store.embedding_function is not None
-        assert vector_store.course_catalog is not None
-        assert vector_store.course_content is not None
+        assert clean_vector_store.max_results == 5
+        assert clean_vector_store.client is not None
+        assert clean_vector_store.embedding_function is not None
+        assert clean_vector_store.course_catalog is not None
+        assert clean_vector_store.course_content is not None
 
-    def test_add_course_metadata(self, vector_store, sample_course):
+    def test_add_course_metadata(self, clean_vector_store, sample_course):
         """Test adding course metadata to catalog"""
-        vector_store.add_course_metadata(sample_course)
+        clean_vector_store.add_course_metadata(sample_course)
 
         # Verify course was added
-        course_titles = vector_store.get_existing_course_titles()
+        course_titles = clean_vector_store.get_existing_course_titles()
         assert "Introduction to Python" in course_titles
 
-    def test_add_course_content(self, vector_store, sample_chunks):
+    def test_add_course_content(self, clean_vector_store, sample_chunks):
         """Test adding course content chunks"""
-        vector_store.add_course_content(sample_chunks)
+        clean_vector_store.add_course_content(sample_chunks)
 
         # Verify chunks were added by searching
-        results = vector_store.search("Python programming")
+        results = clean_vector_store.search("Python programming")
+        assert not results.is_empty()
+
+    def test_add_course(self, clean_vector_store, sample_course, sample_chunks):
+        """Test adding a course's metadata and content in one call"""
+        clean_vector_store.add_course(sample_course, sample_chunks)
+
+        assert clean_vector_store.get_existing_course_titles() == ["Introduction to Python"]
+        results = clean_vector_store.search("Variables", course_name="Introduction to Python")
         assert not results.is_empty()
 
-    def test_add_course_content_empty_list(self, vector_store):
+    def test_add_course_content_empty_list(self, clean_vector_store):
         """Test adding empty list of chunks doesn't error"""
-        vector_store.add_course_content([])  # Should not raise error
+        clean_vector_store.add_course_content([])  # Should not raise error
 
-    def test_get_existing_course_titles(self, vector_store, sample_course):
+    def test_get_existing_course_titles(self, clean_vector_store, sample_course):
         """Test retrieving existing course titles"""
         # Initially empty (cleared by fixture)
-        titles = vector_store.get_existing_course_titles()
+        titles = clean_vector_store.get_existing_course_titles()
         assert titles == []
 
         # Add a course
-        vector_store.add_course_metadata(sample_course)
+        clean_vector_store.add_course_metadata(sample_course)
 
         # Should now return the course
-        titles = vector_store.get_existing_course_titles()
+        titles = clean_vector_store.get_existing_course_titles()
         assert len(titles) == 1
         assert "Introduction to Python" in titles
 
-    def test_get_course_count(self, vector_store, sample_course):
+    def test_get_course_count(self, clean_vector_store, sample_course):
         """Test getting course count"""
         # Initially 0
-        count = vector_store.get_course_count()
+        count = clean_vector_store.get_course_count()
         assert count == 0
 
         # Add a course
-        vector_store.add_course_metadata(sample_course)
+        clean_vector_store.add_course_metadata(sample_course)
 
         # Should be 1
-        count = vector_store.get_course_count()
+        count = clean_vector_store.get_course_count()
         assert count == 1
 
-    def test_search_basic(self, vector_store, sample_course, sample_chunks):
+    def test_search_basic(self, populated_vector_store):
         """Test basic search functionality"""
-        vector_store.add_course_metadata(sample_course)
-        vector_store.add_course_content(sample_chunks)
-
-        results = vector_store.search("Python programming language")
+        results = populated_vector_store.search("Python programming language")
 
         assert not results.is_empty()
         assert len(results.documents) > 0
         assert results.error is None
 
-    def test_search_with_course_filter(self, vector_store, sample_course, sample_chunks):
+    def test_search_with_course_filter(self, populated_vector_store):
         """Test search with course name filter"""
-        vector_store.add_course_metadata(sample_course)
-        vector_store.add_course_content(sample_chunks)
-
-        results = vector_store.search(
+        results = populated_vector_store.search(
             query="Python",
             course_name="Introduction to Python"
         )
@@ -228,12 +157,9 @@ class TestVectorStore:
         for meta in results.metadata:
             assert meta['course_title'] == "Introduction to Python"
 
-    def test_search_with_lesson_filter(self, vector_store, sample_course, sample_chunks):
+    def test_search_with_lesson_filter(self, populated_vector_store):
         """Test search with lesson number filter"""
-        vector_store.add_course_metadata(sample_course)
-        vector_store.add_course_content(sample_chunks)
-
-        results = vector_store.search(
+        results = populated_vector_store.search(
             query="Variables",
             lesson_number=1
         )
@@ -243,12 +169,9 @@ class TestVectorStore:
         for meta in results.metadata:
             assert meta['lesson_number'] == 1
 
-    def test_search_with_both_filters(self, vector_store, sample_course, sample_chunks):
+    def test_search_with_both_filters(self, populated_vector_store):
         """Test search with both course and lesson filters"""
-        vector_store.add_course_metadata(sample_course)
-        vector_store.add_course_content(sample_chunks)
-
-        results = vector_store.search(
+        results = populated_vector_store.search(
             query="Python",
             course_name="Introduction to Python",
             lesson_number=1
@@ -259,92 +182,131 @@ class TestVectorStore:
             assert meta['course_title'] == "Introduction to Python"
             assert meta['lesson_number'] == 1
 
-    def test_search_nonexistent_course(self, vector_store, sample_course, sample_chunks):
+    def test_search_nonexistent_course(self, populated_vector_store):
         """Test search with nonexistent course name"""
-        vector_store.add_course_metadata(sample_course)
-        vector_store.add_course_content(sample_chunks)
-
-        results = vector_store.search(
+        results = populated_vector_store.search(
             query="Python",
             course_name="Completely Different Nonexistent Course XYZ123"
         )
 
-        # Should either return error or fuzzy match to existing course
-        # The current implementation does fuzzy matching, so it might return results
-        # We just verify it doesn't crash
-        assert results is not None
+        assert results.is_empty()
+        assert results.error == (
+            "No course found matching 'Completely Different Nonexistent Course XYZ123'"
+        )
 
-    def test_search_respects_limit(self, vector_store, sample_course, sample_chunks):
+    def test_search_respects_limit(self, populated_vector_store):
         """Test that search respects the limit parameter"""
-        vector_store.add_course_metadata(sample_course)
-        vector_store.add_course_content(sample_chunks)
-
-        results = vector_store.search("Python", limit=2)
+        results = populated_vector_store.search("Python", limit=2)
 
         assert len(results.documents) <= 2
 
-    def test_resolve_course_name(self, vector_store, sample_course):
+    def test_resolve_course_name(self, populated_vector_store):
         """Test fuzzy course name resolution"""
-        vector_store.add_course_metadata(sample_course)
-
         # Exact match
-        resolved = vector_store._resolve_course_name("Introduction to Python")
+        resolved = populated_vector_store._resolve_course_name("Introduction to Python")
         assert resolved == "Introduction to Python"
 
         # Partial match
-        resolved = vector_store._resolve_course_name("Python")
+        resolved = populated_vector_store._resolve_course_name("Python")
         assert resolved == "Introduction to Python"
 
-    def test_resolve_course_name_nonexistent(self, vector_store):
+    def test_resolve_course_name_cached(self, clean_vector_store, sample_course):
+        """Test that resolutions reuse the catalog titles until the catalog changes"""
+        clean_vector_store.add_course_metadata(sample_course)
+
+        with patch.object(
+            clean_vector_store.course_catalog,
+            "get",
+            wraps=clean_vector_store.course_catalog.get,
+        ) as catalog_get:
+            assert clean_vector_store._resolve_course_name("Python") == "Introduction to Python"
+            assert clean_vector_store._resolve_course_name("Python") == "Introduction to Python"
+            assert clean_vector_store._resolve_course_name("Intro to Python") == "Introduction to Python"
+            assert clean_vector_store._resolve_course_name("python") == "Introduction to Python"
+
+        assert catalog_get.call_count == 1
+
+        # Clearing the catalog drops the cached titles
+        clean_vector_store.clear_all_data()
+        assert clean_vector_store._resolve_course_name("Python") is None
+
+    def test_resolve_course_name_retries_failed_read(self, clean_vector_store, sample_course):
+        """Test that a failed catalog read isn't cached as an empty catalog"""
+        clean_vector_store.add_course_metadata(sample_course)
+
+        with patch.object(
+            clean_vector_store.course_catalog, "get", side_effect=RuntimeError("db locked")
+        ):
+            assert clean_vector_store._resolve_course_name("Python") is None
+
+        assert clean_vector_store._resolve_course_name("Python") == "Introduction to Python"
+
+    def test_resolve_course_name_docs_catalog(self, clean_vector_store):
+        """Test that short names resolve to the right course in the docs/ catalog"""
+        for course in _docs_courses():
+            clean_vector_store.add_course_metadata(course)
+
+        expected = {
+            "MCP": "MCP: Build Rich-Context AI Apps with Anthropic",
+            "the MCP course": "MCP: Build Rich-Context AI Apps with Anthropic",
+            "Anthropic MCP course": "MCP: Build Rich-Context AI Apps with Anthropic",
+            "Chroma": "Advanced Retrieval for AI with Chroma",
+            "computer use": "Building Towards Computer Use with Anthropic",
+            "prompt compression": "Prompt Compression and Query Optimization",
+        }
+        for course_name, title in expected.items():
+            assert clean_vector_store._resolve_course_name(course_name) == title
+
+        assert clean_vector_store._resolve_course_name("Cooking for Beginners") is None
+
+    def test_resolve_course_name_no_close_match(self, populated_vector_store):
+        """Test that names too far from every title don't resolve"""
+        assert populated_vector_store._resolve_course_name("Quantum Knitting") is None
+
+    def test_resolve_course_name_nonexistent(self, clean_vector_store):
         """Test resolving nonexistent course name"""
-        resolved = vector_store._resolve_course_name("Nonexistent Course")
+        resolved = clean_vector_store._resolve_course_name("Nonexistent Course")
         assert resolved is None
 
-    def test_build_filter_none(self, vector_store):
-        """Test building filter with no parameters"""
-        filter_dict = vector_store._build_filter(None, None)
-        assert filter_dict is None
-
-    def test_build_filter_course_only(self, vector_store):
-        """Test building filter with course only"""
-        filter_dict = vector_store._build_filter("Test Course", None)
-        assert filter_dict == {"course_title": "Test Course"}
-
-    def test_build_filter_lesson_only(self, vector_store):
-        """Test building filter with lesson only"""
-        filter_dict = vector_store._build_filter(None, 1)
-        assert filter_dict == {"lesson_number": 1}
-
-    def test_build_filter_both(self, vector_store):
-        """Test building filter with both course and lesson"""
-        filter_dict = vector_store._build_filter("Test Course", 1)
-        assert filter_dict == {
-            "$and": [
-                {"course_title": "Test Course"},
-                {"lesson_number": 1}
-            ]
-        }
+    @pytest.mark.parametrize(
+        "course,lesson,expected",
+        [
+            (None, None, None),
+            ("Test Course", None, {"course_title": "Test Course"}),
+            (None, 1, {"lesson_number": 1}),
+            (
+                "Test Course",
+                1,
+                {"$and": [{"course_title": "Test Course"}, {"lesson_number": 1}]},
+            ),
+        ],
+        ids=["none", "course_only", "lesson_only", "both"],
+    )
+    def test_build_filter(self, course, lesson, expected):
+        """Test building filters from course and lesson parameters"""
+        filter_dict = VectorStore._build_filter(course, lesson)
+        assert filter_dict == expected
+
+        # Repeated parameters reuse the cached filter
+        assert VectorStore._build_filter(course, lesson) is filter_dict
 
-    def test_clear_all_data(self, vector_store, sample_course, sample_chunks):
+    def test_clear_all_data(self, clean_vector_store, sample_course, sample_chunks):
         """Test clearing all data from collections"""
         # Add data
-        vector_store.add_course_metadata(sample_course)
-        vector_store.add_course_content(sample_chunks)
+        clean_vector_store.add_course(sample_course, sample_chunks)
 
         # Verify data exists
-        assert vector_store.get_course_count() > 0
+        assert clean_vector_store.get_course_count() > 0
 
         # Clear data
-        vector_store.clear_all_data()
+        clean_vector_store.clear_all_data()
 
         # Verify data is cleared
-        assert vector_store.get_course_count() == 0
+        assert clean_vector_store.get_course_count() == 0
 
-    def test_get_all_courses_metadata(self, vector_store, sample_course):
+    def test_get_all_courses_metadata(self, populated_vector_store):
         """Test getting all courses metadata"""
-        vector_store.add_course_metadata(sample_course)
-
-        metadata = vector_store.get_all_courses_metadata()
+        metadata = populated_vector_store.get_all_courses_metadata()
 
         assert len(metadata) == 1
         assert metadata[0]['title'] == "Introduction to Python"
@@ -352,31 +314,42 @@ class TestVectorStore:
         assert 'lessons' in metadata[0]
         assert len(metadata[0]['lessons']) == 2
 
-    def test_get_course_link(self, vector_store, sample_course):
+    def test_get_course_link(self, populated_vector_store):
         """Test getting course link"""
-        vector_store.add_course_metadata(sample_course)
-
-        link = vector_store.get_course_link("Introduction to Python")
+        link = populated_vector_store.get_course_link("Introduction to Python")
 
         assert link == "https://example.com/python"
 
-    def test_get_course_link_nonexistent(self, vector_store):
+    def test_get_course_link_nonexistent(self, clean_vector_store):
         """Test getting link for nonexistent course"""
-        link = vector_store.get_course_link("Nonexistent")
+        link = clean_vector_store.get_course_link("Nonexistent")
         assert link is None
 
-    def test_get_lesson_link(self, vector_store, sample_course):
+    def test_get_lesson_link(self, populated_vector_store):
         """Test getting lesson link"""
-        vector_store.add_course_metadata(sample_course)
-
-        link = vector_store.get_lesson_link("Introduction to Python", 0)
+        link = populated_vector_store.get_lesson_link("Introduction to Python", 0)
 
         assert link == "https://example.com/lesson0"
 
-    def test_get_lesson_link_nonexistent_lesson(self, vector_store, sample_course):
+    def test_get_lesson_link_nonexistent_lesson(self, populated_vector_store):
         """Test getting link for nonexistent lesson"""
-        vector_store.add_course_metadata(sample_course)
-
-        link = vector_store.get_lesson_link("Introduction to Python", 99)
+        link = populated_vector_store.get_lesson_link("Introduction to Python", 99)
 
         assert link is None
+
+    @pytest.mark.slow
+    def test_search_with_real_embedding_model(self, tmp_path, sample_course, sample_chunks):
+        """Test semantic search end to end with the real SentenceTransformer model"""
+        store = VectorStore(
+            chroma_path=str(tmp_path),
+            embedding_model="all-MiniLM-L6-v2",
+            max_results=5
+        )
+        store.add_course(sample_course, sample_chunks)
+
+        assert store._resolve_course_name("Python") == "Introduction to Python"
+
+        results = store.search("How do I store data?", lesson_number=1)
+
+        assert not results.is_empty()
+        assert results.metadata[0]['course_title'] == "Introduction to Python"